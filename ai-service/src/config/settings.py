@@ -25,6 +25,15 @@ class AIServiceSettings(BaseSettings):
     redis_host: str = "redis"
     redis_port: int = 6379
 
+    embedding_model: str = "local-hash"
+    embedding_dim: int = 384
+    embedding_dtype: str = "float32"
+    embedding_cache_dir: str = "/data/embeddings"
+    embedding_cache_redis: bool = False
+    embedding_cache_ttl_seconds: int = 7 * 24 * 3600
+    embedding_batch_size: int = 32
+    embedding_batch_window_ms: float = 5.0
+
 
 @lru_cache
 def get_settings() -> AIServiceSettings:
@@ -0,0 +1,4 @@
+"""Model wrappers package."""
+from .embeddings import EmbeddingService, HashEmbedding, get_embedding_service
+
+__all__ = ["EmbeddingService", "HashEmbedding", "get_embedding_service"]
@@ -0,0 +1,400 @@
+"""Shared embedding service with content-hash caching and request micro-batching."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol, Sequence
+
+import numpy as np
+from loguru import logger
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is an optional cache tier
+    redis_asyncio = None
+
+from ..config.settings import AIServiceSettings, get_settings
+
+
+SUPPORTED_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+
+def content_key(model: str, dim: int, dtype: str, text: str) -> str:
+    """Return the cache key for ``text`` embedded by ``model`` as ``dim`` x ``dtype``."""
+
+    return hashlib.sha256(f"{model}:{dim}:{dtype}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingBackend(Protocol):
+    """Anything that can embed a batch of texts into an ``(n, dim)`` array."""
+
+    name: str
+    dim: int
+
+    async def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+class HashEmbedding:
+    """Deterministic local embedding stand-in for tests and offline development.
+
+    Each text seeds a RNG from its SHA-256 digest, so the same text always maps
+    to the same unit vector without any model or network access.
+    """
+
+    def __init__(self, dim: int = 384, name: str = "local-hash") -> None:
+        self.dim = dim
+        self.name = name
+
+    async def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([self._embed_one(text) for text in texts])
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+        return vector
+
+
+@dataclass
+class EmbeddingMetrics:
+    """Counters for cache effectiveness and batch utilisation."""
+
+    cache_hits: int = 0
+    cache_misses: int = 0
+    batches: int = 0
+    batched_items: int = 0
+    batch_capacity: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    @property
+    def batch_fill(self) -> float:
+        return self.batched_items / self.batch_capacity if self.batch_capacity else 0.0
+
+    def record_batch(self, size: int, capacity: int) -> None:
+        self.batches += 1
+        self.batched_items += size
+        self.batch_capacity += capacity
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.hit_rate,
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "batch_fill": self.batch_fill,
+        }
+
+
+class EmbeddingCache:
+    """Content-hash keyed vector cache on local disk, optionally mirrored in Redis.
+
+    Vectors are stored as raw ``float32``/``float16`` bytes rather than JSON
+    lists. Entries are partitioned by dimension and dtype, since raw bytes of
+    one layout can have the same length as another. Disk is checked first;
+    Redis hits are written back to disk. Cache errors are logged and never
+    fail an embedding: a failed read is a miss and a failed write is skipped.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None,
+        dim: int,
+        dtype: str = "float32",
+        redis_client: "redis_asyncio.Redis | None" = None,
+        ttl_seconds: int | None = None,
+        namespace: str = "emb",
+    ) -> None:
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.directory = Path(directory) if directory else None
+        self.dim = dim
+        self.dtype = np.dtype(SUPPORTED_DTYPES[dtype])
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._layout = f"{self.dtype.name}-{dim}"
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        if self.directory is not None:
+            found = await asyncio.to_thread(self._read_disk, keys)
+
+        remaining = [key for key in keys if key not in found]
+        if self.redis is None or not remaining:
+            return found
+
+        try:
+            payloads = await self.redis.mget([self._redis_key(key) for key in remaining])
+        except Exception as exc:
+            logger.warning("Embedding cache Redis read failed: {}", exc)
+            return found
+
+        from_redis = {
+            key: vector
+            for key, payload in zip(remaining, payloads)
+            if (vector := self._decode(payload)) is not None
+        }
+        if from_redis and self.directory is not None:
+            await self._write_disk_safely(from_redis)
+        found.update(from_redis)
+        return found
+
+    async def set_many(self, items: dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        encoded = {key: np.asarray(vector, dtype=self.dtype) for key, vector in items.items()}
+        if self.directory is not None:
+            await self._write_disk_safely(encoded)
+        if self.redis is not None:
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key, vector in encoded.items():
+                        pipe.set(self._redis_key(key), vector.tobytes(), ex=self.ttl_seconds)
+                    await pipe.execute()
+            except Exception as exc:
+                logger.warning("Embedding cache Redis write failed: {}", exc)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / self._layout / key[:2] / f"{key}.bin"
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{self._layout}:{key}"
+
+    def _decode(self, payload: bytes | None) -> np.ndarray | None:
+        if payload is None or len(payload) != self.dim * self.dtype.itemsize:
+            return None
+        return np.frombuffer(payload, dtype=self.dtype)
+
+    def _read_disk(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        for key in keys:
+            try:
+                payload = self._path(key).read_bytes()
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                logger.warning("Embedding cache disk read failed for {}: {}", key, exc)
+                continue
+            vector = self._decode(payload)
+            if vector is not None:
+                found[key] = vector
+        return found
+
+    async def _write_disk_safely(self, items: dict[str, np.ndarray]) -> None:
+        try:
+            await asyncio.to_thread(self._write_disk, items)
+        except OSError as exc:
+            logger.warning("Embedding cache disk write failed: {}", exc)
+
+    def _write_disk(self, items: dict[str, np.ndarray]) -> None:
+        for key, vector in items.items():
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a uniquely named temp file then rename, so concurrent
+            # readers and writers of the same key never see a partial vector.
+            tmp = tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+            try:
+                with tmp:
+                    tmp.write(np.asarray(vector, dtype=self.dtype).tobytes())
+                os.replace(tmp.name, path)
+            except OSError:
+                Path(tmp.name).unlink(missing_ok=True)
+                # Losing a rename race is harmless: the winner wrote the same vector.
+                if not path.exists():
+                    raise
+
+
+class EmbeddingBatcher:
+    """Collect concurrent embedding requests into fixed-size backend calls.
+
+    A batch is dispatched as soon as ``batch_size`` texts are queued, or when
+    ``window_ms`` has passed since the first text of a partial batch arrived.
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        batch_size: int = 32,
+        window_ms: float = 5.0,
+        metrics: EmbeddingMetrics | None = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.window_ms = window_ms
+        self.metrics = metrics if metrics is not None else EmbeddingMetrics()
+        self._pending: list[tuple[str, asyncio.Future[np.ndarray]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[np.ndarray] = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size :]
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.window_ms / 1000, self._flush)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future[np.ndarray]]]) -> None:
+        try:
+            vectors = np.asarray(await self.backend.embed_batch([text for text, _ in batch]))
+            if vectors.shape != (len(batch), self.backend.dim):
+                raise ValueError(
+                    f"Embedding backend returned shape {vectors.shape}, "
+                    f"expected {(len(batch), self.backend.dim)}"
+                )
+        except BaseException as exc:
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+
+        self.metrics.record_batch(len(batch), self.batch_size)
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+
+class EmbeddingService:
+    """Cache-first embedding entry point shared by retrieval and ingestion.
+
+    Identical texts are embedded once: cached vectors are reused across calls,
+    and concurrent requests for the same uncached text share one computation.
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        cache: EmbeddingCache | None = None,
+        batch_size: int = 32,
+        window_ms: float = 5.0,
+        dtype: str = "float32",
+    ) -> None:
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.backend = backend
+        self.cache = cache
+        self.dtype = np.dtype(SUPPORTED_DTYPES[dtype])
+        self.metrics = EmbeddingMetrics()
+        self.batcher = EmbeddingBatcher(backend, batch_size, window_ms, self.metrics)
+        self._inflight: dict[str, asyncio.Task[dict[str, np.ndarray]]] = {}
+        self._tasks: set[asyncio.Task[dict[str, np.ndarray]]] = set()
+
+    async def embed(self, text: str) -> np.ndarray:
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an ``(len(texts), dim)`` array of embeddings in input order."""
+
+        if not texts:
+            return np.empty((0, self.backend.dim), dtype=self.dtype)
+
+        keys = [content_key(self.backend.name, self.backend.dim, self.dtype.name, text) for text in texts]
+        unique = dict(zip(keys, texts))
+
+        vectors = await self.cache.get_many(list(unique)) if self.cache is not None else {}
+        self.metrics.cache_hits += len(vectors)
+        misses = [key for key in unique if key not in vectors]
+        self.metrics.cache_misses += len(misses)
+
+        # Texts already in flight are shared; the rest start one computation task.
+        owned = {key: unique[key] for key in misses if key not in self._inflight}
+        if owned:
+            task = asyncio.ensure_future(self._compute(owned))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            for key in owned:
+                self._inflight[key] = task
+
+        # Shield shared tasks so one cancelled caller does not cancel the others,
+        # and so the cache write-back still happens if the starting caller goes away.
+        tasks = list(dict.fromkeys(self._inflight[key] for key in misses))
+        for computed in await asyncio.gather(*(asyncio.shield(task) for task in tasks)):
+            vectors.update(computed)
+
+        return np.stack([np.asarray(vectors[key], dtype=self.dtype) for key in keys])
+
+    async def _compute(self, texts: dict[str, str]) -> dict[str, np.ndarray]:
+        try:
+            computed = await asyncio.gather(*(self.batcher.submit(text) for text in texts.values()))
+            vectors = {key: np.asarray(vector, dtype=self.dtype) for key, vector in zip(texts, computed)}
+            # One write-back per computation keeps cache I/O batched alongside the backend calls.
+            if self.cache is not None:
+                await self.cache.set_many(vectors)
+            return vectors
+        finally:
+            for key in texts:
+                self._inflight.pop(key, None)
+
+
+def build_embedding_service(
+    settings: AIServiceSettings, backend: EmbeddingBackend | None = None
+) -> EmbeddingService:
+    """Assemble an embedding service from settings."""
+
+    if backend is None:
+        if settings.embedding_model != "local-hash":
+            raise ValueError(f"No embedding backend registered for {settings.embedding_model!r}")
+        backend = HashEmbedding(dim=settings.embedding_dim, name=settings.embedding_model)
+
+    redis_client = None
+    if settings.embedding_cache_redis:
+        if redis_asyncio is None:
+            raise RuntimeError("embedding_cache_redis is enabled but the redis package is not installed")
+        redis_client = redis_asyncio.Redis(host=settings.redis_host, port=settings.redis_port)
+
+    cache = EmbeddingCache(
+        directory=settings.embedding_cache_dir,
+        dim=backend.dim,
+        dtype=settings.embedding_dtype,
+        redis_client=redis_client,
+        ttl_seconds=settings.embedding_cache_ttl_seconds,
+    )
+    return EmbeddingService(
+        backend,
+        cache=cache,
+        batch_size=settings.embedding_batch_size,
+        window_ms=settings.embedding_batch_window_ms,
+        dtype=settings.embedding_dtype,
+    )
+
+
+@lru_cache
+def get_embedding_service() -> EmbeddingService:
+    """Return the process-wide embedding service."""
+
+    return build_embedding_service(get_settings())
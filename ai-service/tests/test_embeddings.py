@@ -0,0 +1,194 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.models.embeddings import (
+    EmbeddingBatcher,
+    EmbeddingCache,
+    EmbeddingService,
+    HashEmbedding,
+    content_key,
+)
+
+DIM = 16
+
+
+class CountingBackend(HashEmbedding):
+    def __init__(self) -> None:
+        super().__init__(dim=DIM)
+        self.calls: list[list[str]] = []
+
+    async def embed_batch(self, texts):
+        self.calls.append(list(texts))
+        return await super().embed_batch(texts)
+
+
+class ShortBackend(HashEmbedding):
+    async def embed_batch(self, texts):
+        return (await super().embed_batch(texts))[:-1]
+
+
+class FailingRedis:
+    async def mget(self, keys):
+        raise ConnectionError("redis down")
+
+    def pipeline(self, transaction=True):
+        raise ConnectionError("redis down")
+
+
+def make_service(tmp_path, dtype="float32", batch_size=4, window_ms=1.0, backend=None, **cache_kwargs):
+    backend = backend or CountingBackend()
+    cache = EmbeddingCache(tmp_path, dim=DIM, dtype=dtype, **cache_kwargs)
+    return EmbeddingService(backend, cache=cache, batch_size=batch_size, window_ms=window_ms, dtype=dtype)
+
+
+def test_hash_embedding_is_deterministic_unit_vectors():
+    backend = HashEmbedding(dim=DIM)
+    first, second = asyncio.run(backend.embed_batch(["a", "a"]))
+
+    assert np.array_equal(first, second)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+
+
+def test_batcher_fills_batches_and_flushes_partial_on_window():
+    async def run():
+        backend = CountingBackend()
+        batcher = EmbeddingBatcher(backend, batch_size=4, window_ms=1.0)
+        vectors = await asyncio.gather(*(batcher.submit(f"t{i}") for i in range(6)))
+        return backend, batcher, vectors
+
+    backend, batcher, vectors = asyncio.run(run())
+
+    assert [len(call) for call in backend.calls] == [4, 2]
+    assert len(vectors) == 6
+    assert batcher.metrics.batches == 2
+    assert batcher.metrics.batch_fill == pytest.approx(6 / 8)
+
+
+def test_batcher_fails_futures_on_wrong_vector_count():
+    async def run():
+        batcher = EmbeddingBatcher(ShortBackend(dim=DIM), batch_size=2, window_ms=1.0)
+        return await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+
+    results = asyncio.run(asyncio.wait_for(run(), timeout=1))
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_concurrent_duplicates_share_one_computation(tmp_path):
+    async def run():
+        service = make_service(tmp_path)
+        results = await asyncio.gather(*(service.embed(f"t{i % 3}") for i in range(9)))
+        return service, results
+
+    service, results = asyncio.run(run())
+
+    assert sorted(text for call in service.backend.calls for text in call) == ["t0", "t1", "t2"]
+    assert np.array_equal(results[0], results[3])
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_disk_cache_round_trip(tmp_path, dtype):
+    texts = ["alpha", "beta", "alpha"]
+    first = make_service(tmp_path, dtype=dtype)
+    computed = asyncio.run(first.embed_many(texts))
+
+    second = make_service(tmp_path, dtype=dtype)
+    cached = asyncio.run(second.embed_many(texts))
+
+    assert computed.shape == (3, DIM) and computed.dtype == np.dtype(dtype)
+    assert np.array_equal(computed, cached)
+    assert second.backend.calls == []
+    assert first.metrics.hit_rate == 0.0
+    assert second.metrics.hit_rate == 1.0
+    assert len(list(tmp_path.rglob("*.tmp"))) == 0
+
+
+def test_concurrent_disk_writes_of_same_key(tmp_path):
+    cache = EmbeddingCache(tmp_path, dim=DIM)
+    vector = np.ones(DIM, dtype=np.float32)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for future in [pool.submit(cache._write_disk, {"ab" * 32: vector}) for _ in range(32)]:
+            future.result()
+
+    assert np.array_equal(cache._read_disk(["ab" * 32])["ab" * 32], vector)
+    assert len(list(tmp_path.rglob("*.tmp"))) == 0
+
+
+def test_cache_write_back_is_batched_per_call(tmp_path, monkeypatch):
+    service = make_service(tmp_path, batch_size=8)
+    writes = []
+    original = service.cache.set_many
+
+    async def recording_set_many(items):
+        writes.append(len(items))
+        await original(items)
+
+    monkeypatch.setattr(service.cache, "set_many", recording_set_many)
+    asyncio.run(service.embed_many([f"chunk {i}" for i in range(20)]))
+
+    assert writes == [20]
+
+
+def test_cache_failures_do_not_fail_embedding(tmp_path):
+    blocked = tmp_path / "not-a-dir"
+    blocked.write_text("")
+    service = make_service(blocked, redis_client=FailingRedis())
+
+    vectors = asyncio.run(service.embed_many(["a", "b"]))
+
+    assert vectors.shape == (2, DIM)
+    assert service.metrics.cache_misses == 2
+
+
+def test_cancelled_first_caller_still_writes_cache(tmp_path):
+    async def run():
+        # A long batch window keeps "x" in flight until both callers are waiting on it.
+        service = make_service(tmp_path, batch_size=8, window_ms=200.0)
+        first = asyncio.create_task(service.embed("x"))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(service.embed("x"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        vector = await second
+        cached = await service.cache.get_many(
+            [content_key(service.backend.name, DIM, "float32", "x")]
+        )
+        return service, vector, cached
+
+    service, vector, cached = asyncio.run(run())
+
+    assert service.backend.calls == [["x"]]
+    assert np.array_equal(next(iter(cached.values())), vector)
+
+
+@pytest.mark.parametrize(
+    "first_layout, second_layout",
+    [((DIM, "float32"), (DIM * 2, "float16")), ((DIM, "float32"), (DIM, "float16"))],
+)
+def test_cache_is_partitioned_by_dim_and_dtype(tmp_path, first_layout, second_layout):
+    (first_dim, first_dtype), (second_dim, second_dtype) = first_layout, second_layout
+    first = EmbeddingService(
+        HashEmbedding(dim=first_dim), cache=EmbeddingCache(tmp_path, first_dim, first_dtype), dtype=first_dtype
+    )
+    second = EmbeddingService(
+        HashEmbedding(dim=second_dim), cache=EmbeddingCache(tmp_path, second_dim, second_dtype), dtype=second_dtype
+    )
+
+    asyncio.run(first.embed("hello"))
+    vector = asyncio.run(second.embed("hello"))
+
+    assert second.metrics.cache_hits == 0
+    assert vector.shape == (second_dim,) and vector.dtype == np.dtype(second_dtype)
+    assert np.isclose(np.linalg.norm(vector.astype(np.float32)), 1.0, atol=1e-2)
+
+
+def test_content_key_depends_on_model_and_layout():
+    key = content_key("m1", DIM, "float32", "text")
+
+    assert key != content_key("m2", DIM, "float32", "text")
+    assert key != content_key("m1", DIM * 2, "float32", "text")
+    assert key != content_key("m1", DIM, "float16", "text")
@@ -0,0 +1,184 @@
+"""Benchmark list endpoints against the previous ORM + hand-built model path.
+
+Seeds 10k rows per table under a throwaway user id, compares the current
+routes with equivalent handlers written the old way (full ORM entities,
+per-row Pydantic construction, default JSON encoder), then deletes the seeded
+rows. It never touches the app's configured database: it uses a temporary
+SQLite file unless ``--database-url`` names another database explicitly.
+
+Run from the backend directory:
+
+    python -m benchmarks.list_endpoints [--rows 10000] [--repeat 10]
+    python -m benchmarks.list_endpoints --database-url postgresql+asyncpg://.../bench_db
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.routes import chats, datasources
+from src.api.routes.chats import ChatResponse
+from src.api.routes.datasources import ConnectionResponse, FileResponse
+from src.database.session import Base, get_db
+from src.models.chat import Chat
+from src.models.data_source import Connection, UploadedFile
+
+USER_ID = f"bench-{uuid.uuid4()}"
+
+legacy = APIRouter(prefix="/legacy")
+
+
+@legacy.get("/chats", response_model=List[ChatResponse])
+async def legacy_chats(user_id: str, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Chat).where(Chat.user_id == user_id).order_by(Chat.created_at.desc()))
+    return [
+        ChatResponse(id=chat.id, title=chat.title, created_at=chat.created_at, messages=[])
+        for chat in result.scalars().all()
+    ]
+
+
+@legacy.get("/connections", response_model=List[ConnectionResponse])
+async def legacy_connections(user_id: str, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Connection).where(Connection.user_id == user_id).order_by(Connection.created_at.desc()))
+    return [
+        ConnectionResponse(
+            id=conn.id,
+            name=conn.name,
+            source_type=conn.source_type,
+            status=conn.status,
+            last_synced_at=conn.last_synced_at,
+            created_at=conn.created_at,
+            added_by="You",
+        )
+        for conn in result.scalars().all()
+    ]
+
+
+@legacy.get("/files", response_model=List[FileResponse])
+async def legacy_files(user_id: str, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(UploadedFile).where(UploadedFile.user_id == user_id).order_by(UploadedFile.created_at.desc()))
+    return [
+        FileResponse(
+            id=f.id,
+            filename=f.filename,
+            size=f.size,
+            created_at=f.created_at,
+            connection="Manual Upload",
+            added_by="You",
+        )
+        for f in result.scalars().all()
+    ]
+
+
+def build_app(sessionmaker: async_sessionmaker) -> FastAPI:
+    async def bench_db():
+        async with sessionmaker() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(chats.router)
+    app.include_router(datasources.router)
+    app.include_router(legacy)
+    app.dependency_overrides[get_db] = bench_db
+    return app
+
+
+async def seed(engine: AsyncEngine, sessionmaker: async_sessionmaker, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    start = datetime(2024, 1, 1)
+    async with sessionmaker() as db:
+        for i in range(rows):
+            created_at = start + timedelta(seconds=i)
+            db.add(Chat(user_id=USER_ID, title=f"Chat {i}", created_at=created_at))
+            db.add(Connection(user_id=USER_ID, name=f"Conn {i}", source_type="notion", created_at=created_at))
+            db.add(UploadedFile(
+                user_id=USER_ID,
+                filename=f"file-{i}.pdf",
+                path=f"/uploads/file-{i}.pdf",
+                size=1024 + i,
+                mime_type="application/pdf",
+                created_at=created_at,
+            ))
+        await db.commit()
+
+
+async def cleanup(sessionmaker: async_sessionmaker) -> None:
+    async with sessionmaker() as db:
+        for model in (Chat, Connection, UploadedFile):
+            await db.execute(delete(model).where(model.user_id == USER_ID))
+        await db.commit()
+
+
+async def measure(client: httpx.AsyncClient, path: str, repeat: int) -> tuple[float, float, list]:
+    """Return (median ms, peak allocated MiB, decoded body) for ``path``."""
+
+    params = {"user_id": USER_ID}
+    response = await client.get(path, params=params)  # warm up
+    response.raise_for_status()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        (await client.get(path, params=params)).raise_for_status()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    await client.get(path, params=params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024), response.json()
+
+
+async def main(database_url: str, rows: int, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    await seed(engine, sessionmaker, rows)
+    try:
+        await run(build_app(sessionmaker), rows, repeat)
+    finally:
+        await cleanup(sessionmaker)
+        await engine.dispose()
+
+
+async def run(app: FastAPI, rows: int, repeat: int) -> None:
+    endpoints = [
+        ("chats", "/legacy/chats", "/chats/"),
+        ("connections", "/legacy/connections", "/datasources/connections"),
+        ("files", "/legacy/files", "/datasources/files"),
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{rows} rows, median of {repeat} requests")
+        print(f"{'endpoint':<12} {'legacy ms':>10} {'fast ms':>10} {'speedup':>8} {'legacy MiB':>11} {'fast MiB':>9}")
+        for name, legacy_path, fast_path in endpoints:
+            legacy_ms, legacy_mib, legacy_body = await measure(client, legacy_path, repeat)
+            fast_ms, fast_mib, fast_body = await measure(client, fast_path, repeat)
+            assert len(fast_body) == rows and fast_body == legacy_body, f"{name}: responses differ"
+            print(
+                f"{name:<12} {legacy_ms:>10.1f} {fast_ms:>10.1f} {legacy_ms / fast_ms:>7.2f}x"
+                f" {legacy_mib:>11.1f} {fast_mib:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="async SQLAlchemy URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{tmp_dir}/bench.db"
+        asyncio.run(main(database_url, args.rows, args.repeat))
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
 from pydantic import BaseModel
 from datetime import datetime
 
+from ...database.rows import rows_as_dicts
 from ...database.session import get_db, AsyncSessionLocal
 from ...models.chat import Chat, Message
 
-router = APIRouter(prefix="/chats", tags=["chats"])
+router = APIRouter(prefix="/chats", tags=["chats"], default_response_class=ORJSONResponse)
 
 class MessageCreate(BaseModel):
     role: str
@@ -53,47 +55,31 @@ async def create_chat(chat: ChatCreate, db: AsyncSession = Depends(get_db)):
 
 @router.get("/", response_model=List[ChatResponse])
 async def get_chats(user_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Chat).where(Chat.user_id == user_id).order_by(Chat.created_at.desc()))
-    chats = result.scalars().all()
-    
-    # Manually construct responses to avoid lazy loading
-    return [
-        ChatResponse(
-            id=chat.id,
-            title=chat.title,
-            created_at=chat.created_at,
-            messages=[]  # Don't load messages for chat list
-        )
-        for chat in chats
-    ]
+    # Select plain columns; response_model validates the rows once and
+    # ORJSONResponse serializes. Messages are not loaded for the chat list.
+    result = await db.execute(
+        select(Chat.id, Chat.title, Chat.created_at)
+        .where(Chat.user_id == user_id)
+        .order_by(Chat.created_at.desc())
+    )
+    return rows_as_dicts(result)
 
 @router.get("/{chat_id}", response_model=ChatResponse)
 async def get_chat(chat_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Chat).where(Chat.id == chat_id))
-    chat = result.scalar_one_or_none()
+    result = await db.execute(select(Chat.id, Chat.title, Chat.created_at).where(Chat.id == chat_id))
+    chat = result.mappings().one_or_none()
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
-    
-    # Eager load messages
-    result_msgs = await db.execute(select(Message).where(Message.chat_id == chat_id).order_by(Message.created_at.asc()))
-    messages = result_msgs.scalars().all()
-    
-    # Manually construct response
-    return ChatResponse(
-        id=chat.id,
-        title=chat.title,
-        created_at=chat.created_at,
-        messages=[
-            MessageResponse(
-                id=msg.id,
-                role=msg.role,
-                content=msg.content,
-                created_at=msg.created_at
-            )
-            for msg in messages
-        ]
+
+    result_msgs = await db.execute(
+        select(Message.id, Message.role, Message.content, Message.created_at)
+        .where(Message.chat_id == chat_id)
+        .order_by(Message.created_at.asc())
     )
 
+    # Plain dicts of column rows; response_model performs the only validation pass
+    return {**chat, "messages": rows_as_dicts(result_msgs)}
+
 @router.post("/{chat_id}/messages", response_model=MessageResponse)
 async def add_message(chat_id: str, message: MessageCreate, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Chat).where(Chat.id == chat_id))
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, literal
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 import uuid
 
+from ...database.rows import rows_as_dicts
 from ...database.session import get_db
 from ...models.data_source import Connection, UploadedFile
 
-router = APIRouter(prefix="/datasources", tags=["datasources"])
+router = APIRouter(prefix="/datasources", tags=["datasources"], default_response_class=ORJSONResponse)
 
 class ConnectionCreate(BaseModel):
     name: str
@@ -43,20 +45,21 @@ class FileResponse(BaseModel):
 
 @router.get("/connections", response_model=List[ConnectionResponse])
 async def get_connections(user_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Connection).where(Connection.user_id == user_id).order_by(Connection.created_at.desc()))
-    connections = result.scalars().all()
-    
-    return [
-        ConnectionResponse(
-            id=conn.id,
-            name=conn.name,
-            source_type=conn.source_type,
-            status=conn.status,
-            last_synced_at=conn.last_synced_at,
-            created_at=conn.created_at,
-            added_by="You" # Placeholder, ideally fetch user
-        ) for conn in connections
-    ]
+    # Plain column rows are validated once by response_model, then serialized by ORJSONResponse
+    result = await db.execute(
+        select(
+            Connection.id,
+            Connection.name,
+            Connection.source_type,
+            Connection.status,
+            Connection.last_synced_at,
+            Connection.created_at,
+            literal("You").label("added_by"),  # Placeholder, ideally fetch user
+        )
+        .where(Connection.user_id == user_id)
+        .order_by(Connection.created_at.desc())
+    )
+    return rows_as_dicts(result)
 
 @router.post("/connections", response_model=ConnectionResponse)
 async def create_connection(connection: ConnectionCreate, db: AsyncSession = Depends(get_db)):
@@ -97,19 +100,19 @@ async def delete_connection(connection_id: str, db: AsyncSession = Depends(get_d
 
 @router.get("/files", response_model=List[FileResponse])
 async def get_files(user_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(UploadedFile).where(UploadedFile.user_id == user_id).order_by(UploadedFile.created_at.desc()))
-    files = result.scalars().all()
-
-    return [
-        FileResponse(
-            id=f.id,
-            filename=f.filename,
-            size=f.size,
-            created_at=f.created_at,
-            connection="Manual Upload",
-            added_by="You"
-        ) for f in files
-    ]
+    result = await db.execute(
+        select(
+            UploadedFile.id,
+            UploadedFile.filename,
+            UploadedFile.size,
+            UploadedFile.created_at,
+            literal("Manual Upload").label("connection"),
+            literal("You").label("added_by"),
+        )
+        .where(UploadedFile.user_id == user_id)
+        .order_by(UploadedFile.created_at.desc())
+    )
+    return rows_as_dicts(result)
 
 @router.delete("/files/{file_id}", status_code=204)
 async def delete_file(file_id: str, db: AsyncSession = Depends(get_db)):
@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Result
+
+
+def rows_as_dicts(result: Result) -> list[dict]:
+    """Return column rows as plain dicts.
+
+    Pydantic validates plain dicts far faster than SQLAlchemy ``Row`` objects,
+    whose attribute access goes through Python-level ``__getattr__``.
+    """
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]